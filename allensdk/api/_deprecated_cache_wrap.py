@@ -0,0 +1,110 @@
+# Allen Institute Software License - This software license is the 2-clause BSD
+# license plus a third clause that prohibits redistribution for commercial
+# purposes without further permission.
+#
+# Copyright 2015-2018. Allen Institute. All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Redistributions for commercial purposes are not permitted without the
+# Allen Institute's written permission.
+# For purposes of this license, commercial purposes is the incorporation of the
+# Allen Institute's software into anything for which you will charge fees or
+# other compensation. Contact terms@alleninstitute.org for commercial licensing
+# opportunities.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+from allensdk.api.cache import Cache
+import allensdk.core.json_utilities as ju
+from allensdk.deprecated import deprecated
+
+import pandas as pd
+
+
+@deprecated()
+def wrap(self, fn, path, cache,
+         save_as_json=True,
+         return_dataframe=False,
+         index=None,
+         rename=None,
+         **kwargs):
+    '''make an rma query, save it and return the dataframe.
+
+    Parameters
+    ----------
+    fn : function reference
+        makes the actual query using kwargs.
+    path : string
+        where to save the data
+    cache : boolean
+        True will make the query, False just loads from disk
+    save_as_json : boolean, optional
+        True (default) will save data as json, False as csv
+    return_dataframe : boolean, optional
+        True will cast the return value to a pandas dataframe, False (default) will not
+    index : string, optional
+        column to use as the pandas index
+    rename : list of string tuples, optional
+        (new, old) columns to rename
+    kwargs : objects
+        passed through to the query function
+
+    Returns
+    -------
+    dict or DataFrame
+        data type depends on return_dataframe option.
+
+    Notes
+    -----
+    Column renaming happens after the file is reloaded for json
+    '''
+    if cache is True:
+        json_data = fn(**kwargs)
+
+        if save_as_json is True:
+            ju.write(path, json_data)
+        else:
+            df = pd.DataFrame(json_data)
+            Cache.rename_columns(df, rename)
+
+            if index is not None:
+                df.set_index([index], inplace=True)
+
+            df.to_csv(path)
+
+    # read it back in
+    if save_as_json is True:
+        if return_dataframe is True:
+            data = pd.read_json(path, orient='records')
+            Cache.rename_columns(data, rename)
+            if index is not None:
+                data.set_index([index], inplace=True)
+        else:
+            data = ju.read(path)
+    elif return_dataframe is True:
+        data = Cache.csv_reader(path)
+    else:
+        raise ValueError(
+            'save_as_json=False cannot be used with return_dataframe=False')
+
+    return data
+
@@ -36,16 +36,16 @@
 from allensdk.config.manifest import Manifest, ManifestVersionError
 from allensdk.config.manifest_builder import ManifestBuilder
 import allensdk.core.json_utilities as ju
-from allensdk.deprecated import deprecated
 
 import pandas as pd
-import pandas.io.json as pj
 
 import functools
 from functools import wraps
+from collections import OrderedDict
 import os
 import logging
 import csv
+import threading
 
 
 def memoize(f):
@@ -62,6 +62,135 @@ def memoize(f):
 
    return wrapper
 
+
+_EXISTING_PATHS = set()
+
+def _exists(path):
+    '''os.path.exists that remembers paths it has found.  Missing paths
+    are not remembered, since they may be created later.
+    '''
+    if path in _EXISTING_PATHS:
+        return True
+
+    found = os.path.exists(path)
+
+    if found:
+        _EXISTING_PATHS.add(path)
+
+    return found
+
+
+_EXISTING_DIRS = set()
+
+def _ensure_parent(path):
+    '''Manifest.safe_make_parent_dirs, skipped for directories that were
+    already made.
+    '''
+    dirname = os.path.dirname(path)
+
+    if dirname not in _EXISTING_DIRS:
+        Manifest.safe_make_parent_dirs(path)
+        _EXISTING_DIRS.add(dirname)
+
+
+# (reader, path, mtime, size) -> (DataFrame or None, bytes), least recently
+# used first.  A None frame marks a file that has been read only once.
+_READ_CACHE = OrderedDict()
+_READ_CACHE_SIZE = 16
+_READ_CACHE_MAX_BYTES = 256 * 1024 * 1024
+_READ_CACHE_LOCK = threading.Lock()
+
+def _read_cached(reader, path):
+    '''reader(path), reusing the dataframes from repeated reads of
+    unchanged files.  A file's first read is only noted; its second keeps
+    a copy if that fits within _READ_CACHE_MAX_BYTES.  Callers always get
+    a frame of their own, so they may modify it.
+    '''
+    try:
+        stat = os.stat(path)
+        key = (reader, path, stat.st_mtime, stat.st_size)
+    except (OSError, TypeError):
+        return reader(path)
+
+    with _READ_CACHE_LOCK:
+        seen = key in _READ_CACHE
+
+        if seen:
+            data, nbytes = _READ_CACHE[key] = _READ_CACHE.pop(key)
+
+            if data is not None:
+                return data.copy()
+
+    data = reader(path)
+
+    if not isinstance(data, pd.DataFrame) or _READ_CACHE_MAX_BYTES <= 0:
+        return data
+
+    if not seen:
+        entry = (None, 0)
+    else:
+        nbytes = int(data.memory_usage(index=True, deep=True).sum())
+
+        if nbytes > _READ_CACHE_MAX_BYTES:
+            return data
+
+        entry = (data.copy(), nbytes)
+
+    with _READ_CACHE_LOCK:
+        _READ_CACHE[key] = entry
+        _trim_read_cache()
+
+    return data
+
+
+def _trim_read_cache():
+    '''Evict least recently used entries until the read cache is within
+    its limits.  The caller holds _READ_CACHE_LOCK.
+    '''
+    total = sum(nbytes for _, nbytes in _READ_CACHE.values())
+
+    while _READ_CACHE and (len(_READ_CACHE) > _READ_CACHE_SIZE or
+                           total > _READ_CACHE_MAX_BYTES):
+        _, (_, nbytes) = _READ_CACHE.popitem(last=False)
+        total -= nbytes
+
+
+def _forget_reads(path):
+    with _READ_CACHE_LOCK:
+        for key in [k for k in _READ_CACHE if k[1] == path]:
+            del _READ_CACHE[key]
+
+
+def _json_head(path):
+    '''The first non-whitespace byte of a json file, b'' if there is none.
+    '[' starts a json array; json-lines files start with a record.
+    '''
+    with open(path, 'rb') as f:
+        head = f.read(1)
+
+        while head.isspace():
+            head = f.read(1)
+
+    return head
+
+
+def _auto_chunksize(path):
+    '''Number of rows per chunk for reading a line-oriented file, aiming at
+    1/32 of the file per chunk, clamped to 64 KB - 8 MB.  The row length
+    is estimated from the first 1 MB.
+    '''
+    chunk_bytes = max(64 << 10, min(8 << 20, os.path.getsize(path) // 32))
+
+    with open(path, 'rb') as f:
+        sample = f.read(1 << 20)
+
+    if not sample:
+        return 1
+
+    rows = sample.count(b'\n') or 1
+
+    return max(1, chunk_bytes * rows // len(sample))
+
 class Cache(object):
     _log = logging.getLogger('allensdk.api.cache')
 
@@ -73,6 +202,14 @@ class Cache(object):
         self.cache = cache
         self.load_manifest(manifest, version)
 
+    def wrap(self, *args, **kwargs):
+        '''Deprecated; see allensdk.api._deprecated_cache_wrap.wrap.
+        '''
+        # only imported if it is used
+        from ._deprecated_cache_wrap import wrap
+
+        return wrap(self, *args, **kwargs)
+
     def get_cache_path(self, file_name, manifest_key, *args):
         '''Helper method for accessing path specs from manifest keys.
 
@@ -91,7 +228,14 @@ class Cache(object):
             if file_name:
                 return file_name
             elif self.manifest:
-                return self.manifest.get_path(manifest_key, *args)
+                key = (manifest_key, args)
+                path = self._path_cache.get(key)
+
+                if path is None:
+                    path = self.manifest.get_path(manifest_key, *args)
+                    self._path_cache[key] = path
+
+                return path
 
         return None
 
@@ -134,6 +278,9 @@ class Cache(object):
         else:
             self.manifest = None
 
+        self._manifest_df = None
+        self._path_cache = {}
+
     def build_manifest(self, file_name):
         '''Creation of default path specifications.
 
@@ -161,9 +308,48 @@ class Cache(object):
 
     def manifest_dataframe(self):
         '''Convenience method to view manifest as a pandas dataframe.
+
+        The dataframe is built once per loaded manifest and shared between
+        calls; copy it before modifying it.
+        '''
+        df = getattr(self, '_manifest_df', None)
+
+        if df is None:
+            df = pd.DataFrame.from_dict(self.manifest.path_info,
+                                        orient='index')
+            self._manifest_df = df
+
+        return df
+
+    @staticmethod
+    def reset_exists_cache():
+        '''Forget which cache files and directories have been seen on disk,
+        e.g. after deleting them outside of the cache.
+        '''
+        _EXISTING_PATHS.clear()
+        _EXISTING_DIRS.clear()
+
+    @staticmethod
+    def reset_read_cache():
+        '''Forget the dataframes kept from recent cache file reads.
         '''
-        return pd.DataFrame.from_dict(self.manifest.path_info,
-                                      orient='index')
+        with _READ_CACHE_LOCK:
+            _READ_CACHE.clear()
+
+    @staticmethod
+    def set_read_cache_limit(max_bytes):
+        '''Bound the memory held by dataframes kept from cache file reads.
+
+        Parameters
+        ----------
+        max_bytes : int
+            Largest total size of the kept dataframes; 0 disables reuse.
+        '''
+        global _READ_CACHE_MAX_BYTES
+
+        with _READ_CACHE_LOCK:
+            _READ_CACHE_MAX_BYTES = max_bytes
+            _trim_read_cache()
 
     @staticmethod
     def json_remove_keys(data, keys):
@@ -213,17 +399,17 @@ class Cache(object):
             edited in place.
         new_old_name_tuples : list of string tuples (new, old)
         '''
-        if new_old_name_tuples is None:
-            new_old_name_tuples = []
-
-        for new_name, old_name in new_old_name_tuples:
-            data.columns = [new_name if c == old_name else c
-                            for c in data.columns]
+        if new_old_name_tuples:
+            data.rename(columns={old_name: new_name
+                                 for new_name, old_name in new_old_name_tuples},
+                        inplace=True)
 
     def load_csv(self,
                  path,
                  rename=None,
-                 index=None):
+                 index=None,
+                 dtype=None,
+                 chunksize=None):
         '''Read a csv file as a pandas dataframe.
 
         Parameters
@@ -232,8 +418,27 @@ class Cache(object):
             columns to rename
         index : string, optional
             post-rename column to use as the row label.
+        dtype : dict, optional
+            column name -> type, skips type inference for those columns.
+        chunksize : int or 'auto', optional
+            number of rows to parse at a time, which bounds peak memory for
+            large files.  'auto' picks it from the file size.
         '''
-        data = pd.DataFrame.from_csv(path)
+        if chunksize is not None:
+            if chunksize == 'auto':
+                chunksize = _auto_chunksize(path)
+
+            chunks = list(pd.read_csv(path,
+                                      index_col=0,
+                                      dtype=dtype,
+                                      chunksize=chunksize))
+
+            if chunks:
+                data = pd.concat(chunks, copy=False)
+            else:
+                data = pd.DataFrame()
+        else:
+            data = Cache.csv_reader(path, dtype=dtype)
 
         Cache.rename_columns(data, rename)
 
@@ -245,7 +450,10 @@ class Cache(object):
     def load_json(self,
                   path,
                   rename=None,
-                  index=None):
+                  index=None,
+                  lines=None,
+                  chunksize=None,
+                  engine=None):
         '''Read a json file as a pandas dataframe.
 
         Parameters
@@ -254,8 +462,39 @@ class Cache(object):
             columns to rename
         index : string, optional
             post-rename column to use as the row label.
+        lines : boolean, optional
+            True if the file holds one json record per line.  By default
+            this is assumed for files ending in .jsonl and otherwise
+            decided from the file's first character.
+        chunksize : int or 'auto', optional
+            number of records to parse at a time from a line-delimited
+            file, which bounds peak memory for large files.  'auto' picks
+            it from the file size.
+        engine : string, optional
+            'pyarrow' to parse an unchunked line-delimited file with
+            pyarrow; see jsonl_reader.  By default pandas parses the file,
+            so the column types do not depend on chunksize.
         '''
-        data = pj.read_json(path, orient='records')
+        if lines is None:
+            lines = str(path).endswith('.jsonl') or _json_head(path) != b'['
+
+        if lines and chunksize is not None:
+            if chunksize == 'auto':
+                chunksize = _auto_chunksize(path)
+
+            chunks = list(pd.read_json(path,
+                                       orient='records',
+                                       lines=True,
+                                       chunksize=chunksize))
+
+            if chunks:
+                data = pd.concat(chunks, ignore_index=True, copy=False)
+            else:
+                data = pd.DataFrame() # empty file
+        elif lines:
+            data = Cache.jsonl_reader(path, engine=engine)
+        else:
+            data = pd.read_json(path, orient='records')
 
         Cache.rename_columns(data, rename)
 
@@ -299,10 +538,11 @@ class Cache(object):
         '''
         path = kwargs.pop('path', None)
         strategy = kwargs.pop('strategy', None)
-        pre = kwargs.pop('pre', lambda d: d)
+        pre = kwargs.pop('pre', None)
         post = kwargs.pop('post', None)
         reader = kwargs.pop('reader', None)
         writer = kwargs.pop('writer', None)
+        data = None
 
         if strategy is None:
             if writer or path:
@@ -313,8 +553,14 @@ class Cache(object):
         if not strategy in ['lazy', 'pass_through', 'file', 'create']:
             raise ValueError("Unknown query strategy: {}.".format(strategy))
 
-        if 'lazy' == strategy:
-            if os.path.exists(path):
+        lazy = 'lazy' == strategy
+
+        if lazy:
+            # without a reader a deleted file would go unnoticed, so only
+            # trust the remembered paths when the read below checks them
+            found = _exists(path) if reader else os.path.exists(path)
+
+            if found:
                 strategy = 'file'
             else:
                 strategy = 'create'
@@ -322,37 +568,105 @@ class Cache(object):
         if strategy == 'pass_through':
                 data = fn(*args, **kwargs)
         elif strategy in ['create']:
-            Manifest.safe_make_parent_dirs(path)
+            _ensure_parent(path)
 
             if writer:
                 data = fn(*args, **kwargs)
-                data = pre(data)
+
+                if pre:
+                    data = pre(data)
+
                 writer(path, data)
             else:
                 data = fn(*args, **kwargs)
 
+            # fn may have written the file itself, e.g. a download
+            _EXISTING_PATHS.add(path)
+            _forget_reads(path)
+
         if reader:
-            data = reader(path)
+            try:
+                data = _read_cached(reader, path)
+            except (IOError, OSError):
+                _EXISTING_PATHS.discard(path)
+
+                if not (lazy and strategy == 'file'):
+                    raise
+
+                # the file was deleted after it was seen; regenerate it
+                return Cache.cacher(fn, *args,
+                                    path=path,
+                                    strategy='create',
+                                    pre=pre,
+                                    post=post,
+                                    reader=reader,
+                                    writer=writer,
+                                    **kwargs)
 
         # Note: don't provide post if fn or reader doesn't return data
         if post:
             data = post(data)
-            return data
 
-        try:
-            data
-            return data
-        except:
-            pass
+        return data
+
+    @staticmethod
+    def cacher_many(fn,
+                    call_list,
+                    max_workers=8,
+                    **kwargs):
+        '''make several cacher calls concurrently on a thread pool.
+        Useful for io-bound queries and downloads.
+
+        Parameters
+        ----------
+        fn : function reference
+            makes the actual query for every call.
+        call_list : list of (tuple, dict)
+            positional and keyword arguments of each call.  The keyword
+            arguments are merged over kwargs.
+        max_workers : int, optional
+            number of threads, default 8.
+        kwargs : objects
+            cacher options and query arguments shared by all calls.
 
-        return
+        Returns
+        -------
+        list
+            result of each call, in the order of call_list.
+
+        Notes
+        -----
+        Calls with the same path run one after another in the same thread,
+        so two threads never write the same file.
+        '''
+        from concurrent.futures import ThreadPoolExecutor
+
+        groups = OrderedDict()
+
+        for i, (call_args, call_kwargs) in enumerate(call_list):
+            merged = dict(kwargs, **call_kwargs)
+            path = merged.get('path', None)
+            key = ('path', path) if path else ('call', i)
+            groups.setdefault(key, []).append((i, call_args, merged))
+
+        results = [None] * len(call_list)
+
+        def run(group):
+            for i, call_args, call_kwargs in group:
+                results[i] = Cache.cacher(fn, *call_args, **call_kwargs)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # consume the iterator to re-raise any exceptions
+            list(executor.map(run, groups.values()))
+
+        return results
 
     @staticmethod
     def csv_writer(pth, gen):
         csv_writer = None
     
         first_row = True
-        row_count = 1
+        row_count = 0
     
         with open(pth, 'w') as output:
             for row in gen:
@@ -364,22 +678,39 @@ class Cache(object):
                                                 quoting=csv.QUOTE_ALL)
                     csv_writer.writeheader()
                     first_row = False
-                Cache._log.info('row: {}'.format(row_count))
                 row_count = row_count + 1
                 csv_writer.writerow(row)
 
+        Cache._log.info('wrote {} rows to {}'.format(row_count, pth))
+
     @staticmethod
-    def cache_csv_json():
+    def csv_reader(pth, dtype=None):
+        '''Read a csv file with a leading index column.  The file is
+        memory-mapped rather than read through a buffer.
+        '''
+        return pd.read_csv(pth, index_col=0, dtype=dtype, memory_map=True)
+
+    @staticmethod
+    def _csv_reader_for(dtype):
+        # the same reader object for the default dtype, so reads through it
+        # can be recognized by the read cache
+        if dtype is None:
+            return Cache.csv_reader
+
+        return functools.partial(Cache.csv_reader, dtype=dtype)
+
+    @staticmethod
+    def cache_csv_json(dtype=None):
         return {
              'writer': Cache.csv_writer,
-             'reader': lambda f: pd.DataFrame.from_csv(f).to_dict('records')
+             'reader': lambda f: Cache.csv_reader(f, dtype).to_dict('records')
         }
 
     @staticmethod
-    def cache_csv_dataframe():
+    def cache_csv_dataframe(dtype=None):
         return {
              'writer': Cache.csv_writer,
-             'reader' : pd.DataFrame.from_csv
+             'reader' : Cache._csv_reader_for(dtype)
         }
 
     @staticmethod
@@ -396,8 +727,113 @@ class Cache(object):
     @staticmethod
     def cache_json_dataframe():
         return {
-             'writer': ju.write,
-             'reader': lambda p: pj.read_json(p, orient='records')
+             'writer': ju.write_lines,
+             'reader': Cache.json_dataframe_reader
+        }
+
+    @staticmethod
+    def feather_writer(pth, data):
+        import pyarrow.feather as feather
+
+        # uncompressed so that the reader can memory-map the columns
+        feather.write_feather(pd.DataFrame(data), pth,
+                              compression='uncompressed')
+
+    @staticmethod
+    def feather_reader(pth):
+        import pyarrow.feather as feather
+
+        return feather.read_feather(pth, memory_map=True)
+
+    @staticmethod
+    def jsonl_reader(pth, engine=None):
+        '''Read line-delimited json records into a dataframe.
+
+        Parameters
+        ----------
+        pth : string
+            file to read
+        engine : string, optional
+            'pyarrow' parses blocks of the file in parallel, if pyarrow is
+            installed.  By default the file is parsed by pandas.
+
+        Notes
+        -----
+        pyarrow infers column types itself, so they can differ from
+        pd.read_json's: e.g. date strings come back timezone-naive and
+        numeric-looking strings stay strings.  Files pyarrow rejects, such
+        as a column mixing numbers and strings, are read with pandas.
+        '''
+        if engine == 'pyarrow':
+            try:
+                import pyarrow as pa
+                import pyarrow.json as pa_json
+            except ImportError:
+                pa = None
+
+            if pa is not None:
+                try:
+                    table = pa_json.read_json(
+                        pth,
+                        read_options=pa_json.ReadOptions(block_size=8 << 20))
+                except pa.ArrowInvalid:
+                    pass
+                else:
+                    return table.to_pandas(self_destruct=True,
+                                           split_blocks=True)
+        elif engine is not None:
+            raise ValueError("Unknown json engine: {}.".format(engine))
+
+        return pd.read_json(pth, orient='records', lines=True)
+
+    @staticmethod
+    def json_dataframe_reader(pth):
+        '''Read json records into a dataframe.  Files holding a json array,
+        as written by ju.write, and json-lines files are both accepted, and
+        both are parsed by pandas so their column types match.
+        '''
+        head = _json_head(pth)
+
+        if not head:
+            return pd.DataFrame()
+        elif head == b'[':
+            return pd.read_json(pth, orient='records')
+
+        return pd.read_json(pth, orient='records', lines=True)
+
+    @staticmethod
+    def cache_parquet_dataframe():
+        '''Requires pyarrow.
+        '''
+        return {
+             'writer': lambda p, x: pd.DataFrame(x).to_parquet(
+                 p, engine='pyarrow', compression='zstd'),
+             'reader': lambda p: pd.read_parquet(p, engine='pyarrow')
+        }
+
+    @staticmethod
+    def cache_arrow_dataframe():
+        '''Requires pyarrow.
+        '''
+        return {
+             'writer': Cache.feather_writer,
+             'reader': Cache.feather_reader
+        }
+
+    @staticmethod
+    def cache_jsonl_dataframe(engine=None):
+        '''engine='pyarrow' reads with pyarrow; see jsonl_reader.
+        '''
+        if engine is None:
+            reader = Cache.jsonl_reader
+        else:
+            reader = functools.partial(Cache.jsonl_reader, engine=engine)
+
+        return {
+             'writer': lambda p, x: pd.DataFrame(x).to_json(p,
+                                                           orient='records',
+                                                           lines=True),
+             'reader': reader
         }
 
     @staticmethod
@@ -408,10 +844,10 @@ class Cache(object):
         }
 
     @staticmethod
-    def cache_csv():
+    def cache_csv(dtype=None):
         return {
             'writer': Cache.csv_writer,
-            'reader': pd.DataFrame.from_csv
+            'reader': Cache._csv_reader_for(dtype)
         }
 
     @staticmethod
@@ -453,81 +889,14 @@ class Cache(object):
             return file_name
         return pf
 
-    @deprecated()
-    def wrap(self, fn, path, cache,
-             save_as_json=True,
-             return_dataframe=False,
-             index=None,
-             rename=None,
-             **kwargs):
-        '''make an rma query, save it and return the dataframe.
-    
-        Parameters
-        ----------
-        fn : function reference
-            makes the actual query using kwargs.
-        path : string
-            where to save the data
-        cache : boolean
-            True will make the query, False just loads from disk
-        save_as_json : boolean, optional
-            True (default) will save data as json, False as csv
-        return_dataframe : boolean, optional
-            True will cast the return value to a pandas dataframe, False (default) will not
-        index : string, optional
-            column to use as the pandas index
-        rename : list of string tuples, optional
-            (new, old) columns to rename
-        kwargs : objects
-            passed through to the query function
-    
-        Returns
-        -------
-        dict or DataFrame
-            data type depends on return_dataframe option.
-    
-        Notes
-        -----
-        Column renaming happens after the file is reloaded for json
-        '''
-        if cache is True:
-            json_data = fn(**kwargs)
-
-            if save_as_json is True:
-                ju.write(path, json_data)
-            else:
-                df = pd.DataFrame(json_data)
-                Cache.rename_columns(df, rename)
-
-                if index is not None:
-                    df.set_index([index], inplace=True)
-
-                df.to_csv(path)
-
-        # read it back in
-        if save_as_json is True:
-            if return_dataframe is True:
-                data = pj.read_json(path, orient='records')
-                Cache.rename_columns(data, rename)
-                if index is not None:
-                    data.set_index([index], inplace=True)
-            else:
-                data = ju.read(path)
-        elif return_dataframe is True:
-            data = pd.DataFrame.from_csv(path)
-        else:
-            raise ValueError(
-                'save_as_json=False cannot be used with return_dataframe=False')
-    
-        return data
-
 
 def cacheable(strategy=None,
               pre=None,
               writer=None,
               reader=None,
               post=None,
-              pathfinder=None):
+              pathfinder=None,
+              parallel=False):
     '''decorator for rma queries, save it and return the dataframe.
 
     Parameters
@@ -549,6 +918,10 @@ def cacheable(strategy=None,
         path -> data, default NOP
     writer : function, optional
         path, data -> None, default NOP
+    parallel : boolean, optional
+        if True, the decorated function accepts a call_list keyword argument
+        of (args, kwargs) tuples and makes those calls concurrently with
+        Cache.cacher_many, returning a list of results.
     kwargs : objects
         passed through to the query function
 
@@ -561,41 +934,44 @@ def cacheable(strategy=None,
     -----
     Column renaming happens after the file is reloaded for json
     '''
-    def decor(func):
-        decor.strategy=strategy
-        decor.pre = pre
-        decor.writer = writer
-        decor.reader = reader
-        decor.post = post
-        decor.pathfinder = pathfinder
+    # options given to the decorator, resolved once rather than per call
+    presets = [(k, v) for k, v in (('strategy', strategy),
+                                   ('pre', pre),
+                                   ('writer', writer),
+                                   ('reader', reader),
+                                   ('post', post)) if v]
 
-        @functools.wraps(func)
-        def w(*args,
-              **kwargs):
-            if decor.pathfinder and not 'pathfinder' in kwargs:
-                pathfinder = decor.pathfinder
+    def decor(func):
+        def prepare(args, kwargs):
+            if pathfinder and not 'pathfinder' in kwargs:
+                path_fn = pathfinder
             else:
-                pathfinder = kwargs.pop('pathfinder', None)
+                path_fn = kwargs.pop('pathfinder', None)
 
-            if pathfinder and not 'path' in kwargs:
-                found_path = pathfinder(*args, **kwargs)
+            if path_fn and not 'path' in kwargs:
+                found_path = path_fn(*args, **kwargs)
                 
                 if found_path:
                     kwargs['path'] = found_path
-            if decor.strategy and not 'strategy' in kwargs:
-                kwargs['strategy'] = decor.strategy
-            if decor.pre and not 'pre' in kwargs:
-                kwargs['pre'] = decor.pre
-            if decor.writer and not 'writer' in kwargs:
-                kwargs['writer'] = decor.writer
-            if decor.reader and not 'reader' in kwargs:
-                kwargs['reader'] = decor.reader
-            if decor.post and not 'post in kwargs':
-                kwargs['post'] = decor.post
+
+            for key, value in presets:
+                kwargs.setdefault(key, value)
+
+            return kwargs
+
+        @functools.wraps(func)
+        def w(*args,
+              **kwargs):
+            if parallel and 'call_list' in kwargs:
+                call_list = kwargs.pop('call_list')
+                call_list = [(a, prepare(a, dict(kwargs, **kw)))
+                             for a, kw in call_list]
+
+                return Cache.cacher_many(func, call_list)
 
             result = Cache.cacher(func,
                                   *args,
-                                  **kwargs)
+                                  **prepare(args, kwargs))
             return result
         
         return w
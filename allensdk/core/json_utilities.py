@@ -49,26 +49,93 @@ try:
     from urllib.parse import urlparse
 except ImportError:
     import urlparse
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
 
 
 def read(file_name):
     """ Shortcut reading JSON from a file. """
     with open(file_name, 'rb') as f:
-        json_string = f.read().decode('utf-8')
-        if len(json_string)==0: # If empty file
-            json_string='{}' # Create a string that will give an empty JSON object instead of an error
-        json_obj = json.loads(json_string)
+        json_bytes = f.read()
+
+    if len(json_bytes)==0: # If empty file
+        json_bytes=b'{}' # Create a string that will give an empty JSON object instead of an error
+
+    if orjson is not None:
+        try:
+            return orjson.loads(json_bytes)
+        except orjson.JSONDecodeError:
+            pass # e.g. NaN literals, which only simplejson accepts
 
-    return json_obj
+    return json.loads(json_bytes.decode('utf-8'))
 
 
 def write(file_name, obj):
     """ Shortcut for writing JSON to a file.  This also takes care of serializing numpy and data types. """
+    json_bytes = write_bytes(obj)
+
     with open(file_name, 'wb') as f:
-        try:
-            f.write(write_string(obj))   # Python 2.7
-        except TypeError:
-            f.write(bytes(write_string(obj), 'utf-8'))  # Python 3
+        if json_bytes is not None:
+            f.write(json_bytes)
+        else:
+            json_string = write_string(obj)
+            try:
+                f.write(json_string)   # Python 2.7
+            except TypeError:
+                f.write(bytes(json_string, 'utf-8'))  # Python 3
+
+
+def write_lines(file_name, records):
+    """ Shortcut for writing JSON records to a file, one per line (json-lines).  Serializes numpy and data types like write. """
+    if hasattr(records, 'to_dict'):
+        records = records.to_dict('records') # DataFrame
+
+    with open(file_name, 'wb') as f:
+        for record in records:
+            json_bytes = None
+
+            if orjson is not None:
+                try:
+                    json_bytes = orjson.dumps(
+                        record,
+                        default=_orjson_handler,
+                        option=(orjson.OPT_NON_STR_KEYS |
+                                orjson.OPT_SERIALIZE_NUMPY))
+                except orjson.JSONEncodeError:
+                    pass
+
+            if json_bytes is None:
+                json_bytes = json.dumps(record,
+                                        ignore_nan=True,
+                                        default=json_handler,
+                                        iterable_as_array=True).encode('utf-8')
+
+            f.write(json_bytes + b'\n')
+
+
+def write_bytes(obj):
+    """ Serialize to utf-8 JSON bytes with orjson, if it is installed.
+
+    Returns None if orjson is not available or cannot serialize the
+    object (e.g. generators), in which case use write_string.
+    """
+    if orjson is None:
+        return None
+
+    try:
+        return orjson.dumps(obj,
+                            default=_orjson_handler,
+                            option=(orjson.OPT_INDENT_2 |
+                                    orjson.OPT_NON_STR_KEYS |
+                                    orjson.OPT_SERIALIZE_NUMPY))
+    except orjson.JSONEncodeError:
+        return None
 
 
 def write_string(obj):
@@ -175,6 +242,17 @@ def json_handler(obj):
             (type(obj), repr(obj)))
 
 
+def _orjson_handler(obj):
+    """ json_handler for orjson.  Iterables become lists first, as with simplejson's iterable_as_array, so the output does not depend on which package wrote it. """
+    if not isinstance(obj, (Mapping, np.ndarray)):
+        try:
+            return list(obj)
+        except TypeError:
+            pass
+
+    return json_handler(obj)
+
+
 class JsonComments(object):
     _oneline_comment = re.compile(r"\/\/.*$",
                                   re.MULTILINE)
@@ -36,16 +36,16 @@
 import os
 
 import pandas as pd
-import pandas.io.json as pj
 import numpy as np
 
 import pytest
-from mock import MagicMock, mock_open, patch
+from mock import MagicMock, call, mock_open, patch
 
-from allensdk.api.cache import Cache, memoize
+from allensdk.api.cache import Cache, memoize, _exists, _ensure_parent, \
+    _auto_chunksize
 from allensdk.api.queries.rma_api import RmaApi
 import allensdk.core.json_utilities as ju
-from allensdk.config.manifest import ManifestVersionError
+from allensdk.config.manifest import Manifest, ManifestVersionError
 from allensdk.config.manifest_builder import ManifestBuilder
 
 _msg = [{'whatever': True}]
@@ -106,6 +106,13 @@ def dummy_cache():
     return DummyCache
 
 
+def test_missing_attribute(cache):
+    assert 'wrap' in dir(Cache)
+
+    with pytest.raises(AttributeError, match="has no attribute 'wrapp'"):
+        cache.wrapp
+
+
 def test_version_update(fn_temp_dir, dummy_cache):
 
     mpath = os.path.join(fn_temp_dir, 'manifest.json')
@@ -126,6 +133,39 @@ def test_load_manifest(tmpdir_factory, dummy_cache):
     assert(os.path.exists(cache.manifest_path))
 
 
+def test_manifest_dataframe(tmpdir_factory, dummy_cache):
+    manifest = tmpdir_factory.mktemp('data').join('test_manifest.json')
+    cache = dummy_cache(manifest=str(manifest))
+
+    df = cache.manifest_dataframe()
+
+    assert df is cache.manifest_dataframe()
+
+    cache.load_manifest(str(manifest))
+
+    assert df is not cache.manifest_dataframe()
+    assert df.equals(cache.manifest_dataframe())
+
+
+def test_get_cache_path(tmpdir_factory, dummy_cache):
+    manifest = tmpdir_factory.mktemp('data').join('test_manifest.json')
+    cache = dummy_cache(manifest=str(manifest))
+    cache.manifest.add_file('EXAMPLE', 'example_%d.json')
+
+    example_1 = os.path.join(os.curdir, 'example_1.json')
+    example_2 = os.path.join(os.curdir, 'example_2.json')
+
+    with patch.object(cache.manifest, 'get_path',
+                      wraps=cache.manifest.get_path) as get_path:
+        assert cache.get_cache_path(None, 'EXAMPLE', 1) == example_1
+        assert cache.get_cache_path(None, 'EXAMPLE', 1) == example_1
+        assert cache.get_cache_path(None, 'EXAMPLE', 2) == example_2
+        assert cache.get_cache_path('x.json', 'EXAMPLE', 2) == 'x.json'
+
+    assert get_path.call_args_list == [call('EXAMPLE', 1),
+                                       call('EXAMPLE', 2)]
+
+
 @patch("allensdk.core.json_utilities.write")
 @patch("allensdk.core.json_utilities.read", return_value=pd.DataFrame(_msg))
 @patch("allensdk.core.json_utilities.read_url_get", return_value={'msg': _msg})
@@ -143,7 +183,7 @@ def test_wrap_json(ju_read_url_get, ju_read, ju_write, rma, cache):
     ju_read.assert_called_once_with('example.txt')
 
 
-@patch("pandas.io.json.read_json", return_value=_msg)
+@patch("pandas.read_json", return_value=_msg)
 @patch("allensdk.core.json_utilities.write")
 @patch("allensdk.core.json_utilities.read_url_get", return_value={'msg': _msg})
 def test_wrap_dataframe(ju_read_url_get, ju_write, mock_read_json, rma, cache):
@@ -160,6 +200,279 @@ def test_wrap_dataframe(ju_read_url_get, ju_write, mock_read_json, rma, cache):
     ju_write.assert_called_once_with('example.txt', _msg)
     mock_read_json.assert_called_once_with('example.txt', orient='records')
 
+def test_rename_columns():
+    df = pd.DataFrame([{'a': 1, 'b': 2, 'c': 3}])
+
+    Cache.rename_columns(df, [('x', 'a'), ('y', 'c')])
+
+    assert sorted(df.columns) == ['b', 'x', 'y']
+    assert df['x'][0] == 1
+    assert df['y'][0] == 3
+
+
+@pytest.mark.parametrize('chunksize', (None, 1, 'auto'))
+def test_load_csv_dtype(tmpdir_factory, cache, chunksize):
+    csv_path = str(tmpdir_factory.mktemp('data').join('example.csv'))
+
+    with open(csv_path, 'w') as f:
+        f.write(',whatever,count\n0,True,1\n1,False,2\n')
+
+    df = cache.load_csv(csv_path,
+                        rename=[('how_many', 'count')],
+                        dtype={'count': np.float64},
+                        chunksize=chunksize)
+
+    assert df['how_many'].dtype == np.float64
+    assert list(df['whatever']) == [True, False]
+    assert list(df.index) == [0, 1]
+
+
+def test_load_csv_no_chunks(cache):
+    with patch('pandas.read_csv', return_value=iter([])):
+        df = cache.load_csv('example.csv', chunksize=10)
+
+    assert df.empty
+
+
+def test_auto_chunksize(tmpdir_factory):
+    path = str(tmpdir_factory.mktemp('data').join('example.csv'))
+
+    with open(path, 'w') as f:
+        f.write('x' * 99 + '\n')
+
+    # small files get the 64 KB minimum: 64 KB / 100 byte rows
+    assert _auto_chunksize(path) == (64 << 10) // 100
+
+    with open(path, 'w') as f:
+        f.writelines(('x' * 99 + '\n' for _ in range(1 << 16)))
+
+    # about 1/32 of a 6.25 MB file
+    assert abs(_auto_chunksize(path) - (1 << 16) // 32) <= 1
+
+
+@pytest.mark.parametrize('chunksize', (None, 1, 2, 10, 'auto'))
+def test_load_json_lines(tmpdir_factory, cache, chunksize):
+    json_path = str(tmpdir_factory.mktemp('data').join('example.json'))
+
+    with open(json_path, 'w') as f:
+        f.write('{"id": 1, "name": "a"}\n'
+                '{"id": 2, "name": "b"}\n'
+                '{"id": 3, "name": "c"}\n')
+
+    df = cache.load_json(json_path,
+                         index='id',
+                         lines=True,
+                         chunksize=chunksize)
+
+    assert list(df.index) == [1, 2, 3]
+    assert list(df['name']) == ['a', 'b', 'c']
+
+
+@pytest.mark.parametrize('chunksize', (None, 10, 'auto'))
+def test_load_json_lines_empty(tmpdir_factory, cache, chunksize):
+    json_path = str(tmpdir_factory.mktemp('data').join('example.jsonl'))
+    ju.write_lines(json_path, [])
+
+    df = cache.load_json(json_path, chunksize=chunksize)
+
+    assert df.empty
+
+
+@pytest.mark.parametrize('writer', (ju.write, ju.write_lines))
+def test_load_json_detects_lines(tmpdir_factory, cache, writer):
+    json_path = str(tmpdir_factory.mktemp('data').join('example.json'))
+    writer(json_path, [{'id': 1}, {'id': 2}])
+
+    df = cache.load_json(json_path)
+
+    assert list(df['id']) == [1, 2]
+
+
+def test_load_json_chunksize_dtypes(tmpdir_factory, cache):
+    json_path = str(tmpdir_factory.mktemp('data').join('example.jsonl'))
+
+    with open(json_path, 'w') as f:
+        f.write('{"created_at": "2017-01-01T00:00:00Z", "code": "0123"}\n'
+                '{"created_at": "2017-01-02T00:00:00Z", "code": "0456"}\n')
+
+    df = cache.load_json(json_path)
+    df_chunked = cache.load_json(json_path, chunksize=10)
+
+    assert df.equals(df_chunked)
+    assert (df.dtypes == df_chunked.dtypes).all()
+
+
+@pytest.mark.parametrize('engine', (None, 'pyarrow'))
+def test_jsonl_reader_mixed_types(tmpdir_factory, engine):
+    json_path = str(tmpdir_factory.mktemp('data').join('example.jsonl'))
+
+    with open(json_path, 'w') as f:
+        f.write('{"value": 1, "other": null}\n'
+                '{"value": "a", "other": "b"}\n'
+                '{"value": 2, "other": {"c": 3}}\n')
+
+    df = Cache.jsonl_reader(json_path, engine=engine)
+
+    assert list(df['value']) == [1, 'a', 2]
+    assert list(df['other'])[1:] == ['b', {'c': 3}]
+
+
+def test_load_json_path_like(tmpdir_factory, cache):
+    json_path = tmpdir_factory.mktemp('data').join('example.jsonl')
+    json_path.write('{"id": 1}\n{"id": 2}\n')
+
+    # a py.path.local, which has no endswith
+    df = cache.load_json(json_path)
+
+    assert list(df['id']) == [1, 2]
+
+
+def test_jsonl_reader_without_pyarrow(tmpdir_factory):
+    json_path = str(tmpdir_factory.mktemp('data').join('example.jsonl'))
+
+    with open(json_path, 'w') as f:
+        f.write('{"id": 1}\n{"id": 2}\n')
+
+    with patch.dict('sys.modules', {'pyarrow.json': None}):
+        df = Cache.jsonl_reader(json_path, engine='pyarrow')
+
+    assert list(df['id']) == [1, 2]
+
+
+def test_jsonl_reader_unknown_engine():
+    with pytest.raises(ValueError):
+        Cache.jsonl_reader('example.jsonl', engine='fastest')
+
+
+def test_exists_cache(tmpdir_factory):
+    path = str(tmpdir_factory.mktemp('data').join('example.json'))
+
+    with patch('os.path.exists', return_value=False) as ope:
+        assert not _exists(path)
+        assert not _exists(path)
+    assert ope.call_count == 2
+
+    with patch('os.path.exists', return_value=True) as ope:
+        assert _exists(path)
+        assert _exists(path)
+    ope.assert_called_once_with(path)
+
+    Cache.reset_exists_cache()
+    assert not _exists(path)
+
+
+def test_cacher_deleted_file(tmpdir_factory):
+    path = str(tmpdir_factory.mktemp('data').join('example.json'))
+    fn = MagicMock(return_value=[{'whatever': True}])
+
+    for _ in range(2):
+        data = Cache.cacher(fn, path=path, **Cache.cache_json())
+        os.remove(path)
+
+    assert fn.call_count == 2
+    assert data == [{'whatever': True}]
+
+    with pytest.raises(IOError):
+        Cache.cacher(fn, path=path, strategy='file', **Cache.cache_json())
+
+
+def test_load_manifest_deleted(tmpdir_factory, dummy_cache):
+    path = str(tmpdir_factory.mktemp('data').join('manifest.json'))
+
+    dummy_cache(manifest=path)
+    os.remove(path)
+    dummy_cache(manifest=path)
+
+    assert os.path.exists(path)
+
+
+def test_ensure_parent():
+    with patch.object(Manifest, 'safe_mkdir') as mkdir:
+        _ensure_parent('/xyz/abc/example.json')
+        _ensure_parent('/xyz/abc/example.csv')
+        _ensure_parent('/xyz/example.csv')
+
+        Cache.reset_exists_cache()
+        _ensure_parent('/xyz/abc/example.json')
+
+    assert mkdir.call_args_list == [call('/xyz/abc'),
+                                    call('/xyz'),
+                                    call('/xyz/abc')]
+
+
+def test_read_cache(tmpdir_factory):
+    path = str(tmpdir_factory.mktemp('data').join('example.csv'))
+
+    with open(path, 'w') as f:
+        f.write(',whatever\n0,True\n')
+
+    reader = MagicMock(side_effect=Cache.csv_reader)
+
+    for _ in range(3):
+        df = Cache.cacher(None, path=path, strategy='file', reader=reader)
+        df['whatever'] = False
+
+    # noted on the first read, kept on the second, reused on the third
+    assert reader.call_count == 2
+
+    df_again = Cache.cacher(None, path=path, strategy='file', reader=reader)
+
+    assert reader.call_count == 2
+    assert df_again['whatever'][0]
+
+    Cache.cacher(lambda: [{'whatever': True}],
+                 path=path,
+                 strategy='create',
+                 writer=Cache.csv_writer,
+                 reader=reader)
+
+    assert reader.call_count == 3
+
+    Cache.reset_read_cache()
+    Cache.cacher(None, path=path, strategy='file', reader=reader)
+
+    assert reader.call_count == 4
+
+
+def test_read_cache_fn_writes_file(tmpdir_factory):
+    path = str(tmpdir_factory.mktemp('data').join('example.csv'))
+
+    def download(value):
+        with open(path, 'w') as f:
+            f.write(',whatever\n0,{}\n'.format(value))
+
+        # as on a filesystem with coarse timestamps
+        os.utime(path, (0, 0))
+
+    for value in (1, 1, 2):
+        df = Cache.cacher(download, value,
+                          path=path,
+                          strategy='create',
+                          reader=Cache.csv_reader)
+
+    assert list(df['whatever']) == [2]
+
+
+@pytest.mark.parametrize('max_bytes', (0, 1))
+def test_read_cache_limit(tmpdir_factory, max_bytes):
+    path = str(tmpdir_factory.mktemp('data').join('example.csv'))
+
+    with open(path, 'w') as f:
+        f.write(',whatever\n0,True\n')
+
+    reader = MagicMock(side_effect=Cache.csv_reader)
+
+    Cache.set_read_cache_limit(max_bytes)
+
+    try:
+        for _ in range(3):
+            Cache.cacher(None, path=path, strategy='file', reader=reader)
+    finally:
+        Cache.set_read_cache_limit(256 * 1024 * 1024)
+
+    assert reader.call_count == 3
+
+
 def test_memoize():
 
         import time
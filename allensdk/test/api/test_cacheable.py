@@ -40,6 +40,7 @@ from allensdk.api.queries.rma_api import RmaApi
 import pandas as pd
 from six.moves import builtins
 from allensdk.config.manifest import Manifest
+import allensdk.core.json_utilities as ju
 
 try:
     import StringIO
@@ -50,17 +51,18 @@ import os
 
 _msg = [{'whatever': True}]
 _pd_msg = pd.DataFrame(_msg)
-_csv_msg = pd.DataFrame.from_csv(StringIO.StringIO(""",whatever
+_csv_msg = pd.read_csv(StringIO.StringIO(""",whatever
 0,True
-"""))
+"""),
+                       index_col=0)
 
 
 @patch("allensdk.core.json_utilities.write")
 @patch("allensdk.core.json_utilities.read", return_value=_msg)
 @patch("allensdk.core.json_utilities.read_url_get", return_value={'msg': _msg})
 @patch('csv.DictWriter')
-@patch.object(pd.DataFrame, 'from_csv', return_value=_csv_msg)
-def test_cacheable_csv_dataframe(from_csv, dictwriter, ju_read_url_get,
+@patch("pandas.read_csv", return_value=_csv_msg)
+def test_cacheable_csv_dataframe(read_csv, dictwriter, ju_read_url_get,
                                  ju_read, ju_write):
     @cacheable()
     def get_hemispheres():
@@ -79,7 +81,9 @@ def test_cacheable_csv_dataframe(from_csv, dictwriter, ju_read_url_get,
 
     ju_read_url_get.assert_called_once_with(
         'http://api.brain-map.org/api/v2/data/query.json?q=model::Hemisphere')
-    from_csv.assert_called_once_with('/xyz/abc/example.txt')
+    read_csv.assert_called_once_with('/xyz/abc/example.txt',
+                                     index_col=0, dtype=None,
+                                     memory_map=True)
     assert not ju_write.called, 'write should not have been called'
     assert not ju_read.called, 'read should not have been called'
     mkdir.assert_called_once_with('/xyz/abc')
@@ -90,8 +94,8 @@ def test_cacheable_csv_dataframe(from_csv, dictwriter, ju_read_url_get,
 @patch("allensdk.core.json_utilities.read", return_value=_msg)
 @patch("allensdk.core.json_utilities.read_url_get", return_value={'msg': _msg})
 @patch.object(Manifest, 'safe_mkdir')
-@patch.object(pd.DataFrame, 'from_csv', return_value=_csv_msg)
-def test_cacheable_json(from_csv, mkdir, ju_read_url_get, ju_read, ju_write):
+@patch("pandas.read_csv", return_value=_csv_msg)
+def test_cacheable_json(read_csv, mkdir, ju_read_url_get, ju_read, ju_write):
     @cacheable()
     def get_hemispheres():
         return RmaApi().model_query(model='Hemisphere')
@@ -104,7 +108,7 @@ def test_cacheable_json(from_csv, mkdir, ju_read_url_get, ju_read, ju_write):
 
     ju_read_url_get.assert_called_once_with(
         'http://api.brain-map.org/api/v2/data/query.json?q=model::Hemisphere')
-    assert not from_csv.called, 'from_csv should not have been called'
+    assert not read_csv.called, 'read_csv should not have been called'
     ju_write.assert_called_once_with('/xyz/abc/example.json',
                                                       _msg)
     ju_read.assert_called_once_with('/xyz/abc/example.json')
@@ -136,8 +140,8 @@ def test_excpt(mkdir, ju_read_url_get, ju_read, ju_write):
 @patch("allensdk.core.json_utilities.write")
 @patch("allensdk.core.json_utilities.read", return_value=_msg)
 @patch("allensdk.core.json_utilities.read_url_get", return_value={'msg': _msg})
-@patch.object(pd.DataFrame, 'from_csv', return_value=_csv_msg)
-def test_cacheable_no_cache_csv(from_csv, ju_read_url_get, ju_read, ju_write):
+@patch("pandas.read_csv", return_value=_csv_msg)
+def test_cacheable_no_cache_csv(read_csv, ju_read_url_get, ju_read, ju_write):
     @cacheable()
     def get_hemispheres():
         return RmaApi().model_query(model='Hemisphere')
@@ -149,32 +153,38 @@ def test_cacheable_no_cache_csv(from_csv, ju_read_url_get, ju_read, ju_write):
     assert df.loc[:, 'whatever'][0]
 
     assert not ju_read_url_get.called
-    from_csv.assert_called_once_with('/xyz/abc/example.csv')
+    read_csv.assert_called_once_with('/xyz/abc/example.csv',
+                                     index_col=0, dtype=None,
+                                     memory_map=True)
     assert not ju_write.called, 'json write should not have been called'
     assert not ju_read.called, 'json read should not have been called'
 
 
-@patch("pandas.io.json.read_json", return_value=_pd_msg)
-@patch.object(pd.DataFrame, "from_csv", return_value=_csv_msg)
-@patch("allensdk.core.json_utilities.write")
+@patch("pandas.read_json", return_value=_pd_msg)
+@patch("pandas.read_csv", return_value=_csv_msg)
+@patch("allensdk.core.json_utilities.write_lines")
 @patch("allensdk.core.json_utilities.read", return_value=_msg)
 @patch("allensdk.core.json_utilities.read_url_get", return_value={'msg': _msg})
 @patch.object(Manifest, 'safe_mkdir')
 def test_cacheable_json_dataframe(mkdir, ju_read_url_get, ju_read, ju_write,
-                                  from_csv, mock_read_json):
+                                  read_csv, mock_read_json):
     @cacheable()
     def get_hemispheres():
         return RmaApi().model_query(model='Hemisphere')
 
-    df = get_hemispheres(path='/xyz/abc/example.json',
-                         strategy='create',
-                         **Cache.cache_json_dataframe())
+    # a json array file from before json-lines
+    with patch(builtins.__name__ + '.open',
+               mock_open(read_data=b'[{"whatever": true}]'),
+               create=True):
+        df = get_hemispheres(path='/xyz/abc/example.json',
+                             strategy='create',
+                             **Cache.cache_json_dataframe())
 
     assert df.loc[:, 'whatever'][0]
 
     ju_read_url_get.assert_called_once_with(
         'http://api.brain-map.org/api/v2/data/query.json?q=model::Hemisphere')
-    assert not from_csv.called, 'from_csv should not have been called'
+    assert not read_csv.called, 'read_csv should not have been called'
     mock_read_json.assert_called_once_with('/xyz/abc/example.json',
                                       orient='records')
     ju_write.assert_called_once_with('/xyz/abc/example.json', _msg)
@@ -182,15 +192,15 @@ def test_cacheable_json_dataframe(mkdir, ju_read_url_get, ju_read, ju_write,
     mkdir.assert_called_once_with('/xyz/abc')
 
 
-@patch("pandas.io.json.read_json", return_value=_pd_msg)
-@patch.object(pd.DataFrame, "from_csv", return_value=_csv_msg)
+@patch("pandas.read_json", return_value=_pd_msg)
+@patch("pandas.read_csv", return_value=_csv_msg)
 @patch("allensdk.core.json_utilities.write")
 @patch("allensdk.core.json_utilities.read", return_value=_msg)
 @patch("allensdk.core.json_utilities.read_url_get", return_value={'msg': _msg})
 @patch('csv.DictWriter')
 @patch.object(Manifest, 'safe_mkdir')
 def test_cacheable_csv_json(mkdir, dictwriter, ju_read_url_get, ju_read,
-                            ju_write, from_csv, mock_read_json):
+                            ju_write, read_csv, mock_read_json):
     @cacheable()
     def get_hemispheres():
         return RmaApi().model_query(model='Hemisphere')
@@ -207,9 +217,11 @@ def test_cacheable_csv_json(mkdir, dictwriter, ju_read_url_get, ju_read,
 
     ju_read_url_get.assert_called_once_with(
         'http://api.brain-map.org/api/v2/data/query.json?q=model::Hemisphere')
-    from_csv.assert_called_once_with('/xyz/example.csv')
+    read_csv.assert_called_once_with('/xyz/example.csv',
+                                     index_col=0, dtype=None,
+                                     memory_map=True)
     dictwriter.return_value.writerow.assert_called()
-    assert not mock_read_json.called, 'pj.read_json should not have been called'
+    assert not mock_read_json.called, 'pd.read_json should not have been called'
     assert not ju_write.called, 'ju.write should not have been called'
     assert not ju_read.called, 'json read should not have been called'
     mkdir.assert_called_once_with('/xyz')
@@ -219,9 +231,9 @@ def test_cacheable_csv_json(mkdir, dictwriter, ju_read_url_get, ju_read,
 @patch("allensdk.core.json_utilities.write")
 @patch("allensdk.core.json_utilities.read", return_value=_msg)
 @patch("allensdk.core.json_utilities.read_url_get", return_value={'msg': _msg})
-@patch.object(pd.DataFrame, "from_csv")
+@patch("pandas.read_csv")
 @patch.object(pd.DataFrame, "to_csv")
-def test_cacheable_no_save(to_csv, from_csv, ju_read_url_get, ju_read,
+def test_cacheable_no_save(to_csv, read_csv, ju_read_url_get, ju_read,
                            ju_write):
     @cacheable()
     def get_hemispheres():
@@ -234,7 +246,7 @@ def test_cacheable_no_save(to_csv, from_csv, ju_read_url_get, ju_read,
     ju_read_url_get.assert_called_once_with(
         'http://api.brain-map.org/api/v2/data/query.json?q=model::Hemisphere')
     assert not to_csv.called, 'to_csv should not have been called'
-    assert not from_csv.called, 'from_csv should not have been called'
+    assert not read_csv.called, 'read_csv should not have been called'
     assert not ju_write.called, 'json write should not have been called'
     assert not ju_read.called, 'json read should not have been called'
 
@@ -242,9 +254,9 @@ def test_cacheable_no_save(to_csv, from_csv, ju_read_url_get, ju_read,
 @patch("allensdk.core.json_utilities.write")
 @patch("allensdk.core.json_utilities.read", return_value=_msg)
 @patch("allensdk.core.json_utilities.read_url_get", return_value={'msg': _msg})
-@patch.object(pd.DataFrame, "from_csv", return_value=_csv_msg)
+@patch("pandas.read_csv", return_value=_csv_msg)
 @patch.object(pd.DataFrame, "to_csv")
-def test_cacheable_no_save_dataframe(to_csv, from_csv, ju_read_url_get,
+def test_cacheable_no_save_dataframe(to_csv, read_csv, ju_read_url_get,
                                      ju_read, ju_write):
     @cacheable()
     def get_hemispheres():
@@ -257,19 +269,19 @@ def test_cacheable_no_save_dataframe(to_csv, from_csv, ju_read_url_get,
     ju_read_url_get.assert_called_once_with(
         'http://api.brain-map.org/api/v2/data/query.json?q=model::Hemisphere')
     assert not to_csv.called, 'to_csv should not have been called'
-    assert not from_csv.called, 'from_csv should not have been called'
+    assert not read_csv.called, 'read_csv should not have been called'
     assert not ju_write.called, 'json write should not have been called'
     assert not ju_read.called, 'json read should not have been called'
 
 
-@patch.object(pd.DataFrame, "from_csv", return_value=_csv_msg)
+@patch("pandas.read_csv", return_value=_csv_msg)
 @patch("allensdk.core.json_utilities.write")
 @patch("allensdk.core.json_utilities.read", return_value=_msg)
 @patch("allensdk.core.json_utilities.read_url_get", return_value={'msg': _msg})
 @patch('csv.DictWriter')
 @patch.object(Manifest, 'safe_mkdir')
 def test_cacheable_lazy_csv_no_file(mkdir, dictwriter, ju_read_url_get,
-                                    ju_read, ju_write, from_csv):
+                                    ju_read, ju_write, read_csv):
     @cacheable()
     def get_hemispheres():
         return RmaApi().model_query(model='Hemisphere')
@@ -289,7 +301,9 @@ def test_cacheable_lazy_csv_no_file(mkdir, dictwriter, ju_read_url_get,
         'http://api.brain-map.org/api/v2/data/query.json?q=model::Hemisphere')
     open_mock.assert_called_once_with('/xyz/abc/example.csv', 'w')
     dictwriter.return_value.writerow.assert_called()
-    from_csv.assert_called_once_with('/xyz/abc/example.csv')
+    read_csv.assert_called_once_with('/xyz/abc/example.csv',
+                                     index_col=0, dtype=None,
+                                     memory_map=True)
     assert not ju_write.called, 'json write should not have been called'
     assert not ju_read.called, 'json read should not have been called'
 
@@ -297,8 +311,8 @@ def test_cacheable_lazy_csv_no_file(mkdir, dictwriter, ju_read_url_get,
 @patch("allensdk.core.json_utilities.write")
 @patch("allensdk.core.json_utilities.read", return_value=_msg)
 @patch("allensdk.core.json_utilities.read_url_get", return_value={'msg': _msg})
-@patch.object(pd.DataFrame, "from_csv", return_value=_csv_msg)
-def test_cacheable_lazy_csv_file_exists(from_csv, ju_read_url_get, ju_read,
+@patch("pandas.read_csv", return_value=_csv_msg)
+def test_cacheable_lazy_csv_file_exists(read_csv, ju_read_url_get, ju_read,
                                         ju_write):
     @cacheable()
     def get_hemispheres():
@@ -312,6 +326,156 @@ def test_cacheable_lazy_csv_file_exists(from_csv, ju_read_url_get, ju_read,
     assert df.loc[:, 'whatever'][0]
 
     assert not ju_read_url_get.called
-    from_csv.assert_called_once_with('/xyz/abc/example.csv')
+    read_csv.assert_called_once_with('/xyz/abc/example.csv',
+                                     index_col=0, dtype=None,
+                                     memory_map=True)
     assert not ju_write.called, 'json write should not have been called'
-    assert not ju_read.called, 'json read should not have been called'
\ No newline at end of file
+    assert not ju_read.called, 'json read should not have been called'
+
+@pytest.mark.parametrize('cache_style',
+                         (Cache.cache_parquet_dataframe,
+                          Cache.cache_arrow_dataframe,
+                          Cache.cache_jsonl_dataframe,
+                          lambda: Cache.cache_jsonl_dataframe('pyarrow'),
+                          Cache.cache_json_dataframe))
+@patch("allensdk.core.json_utilities.read_url_get",
+       return_value={'msg': [{'whatever': True, 'id': 1},
+                             {'whatever': False, 'id': 2}]})
+def test_cacheable_dataframe_formats(ju_read_url_get, tmpdir_factory,
+                                     cache_style):
+    pytest.importorskip('pyarrow')
+
+    @cacheable()
+    def get_hemispheres():
+        return RmaApi().model_query(model='Hemisphere')
+
+    path = str(tmpdir_factory.mktemp('data').join('example.bin'))
+
+    df = get_hemispheres(path=path,
+                         strategy='lazy',
+                         **cache_style())
+    df_file = get_hemispheres(path=path,
+                              strategy='lazy',
+                              **cache_style())
+
+    ju_read_url_get.assert_called_once_with(
+        'http://api.brain-map.org/api/v2/data/query.json?q=model::Hemisphere')
+    assert list(df['whatever']) == [True, False]
+    assert df.equals(df_file)
+
+
+@patch("allensdk.core.json_utilities.write")
+@patch("allensdk.core.json_utilities.read", return_value=_msg)
+@patch.object(Manifest, 'safe_mkdir')
+def test_cacher_pre_none(mkdir, ju_read, ju_write):
+    data = Cache.cacher(lambda: _msg,
+                        path='/xyz/abc/example.json',
+                        strategy='create',
+                        pre=None,
+                        **Cache.cache_json())
+
+    assert data == _msg
+    ju_write.assert_called_once_with('/xyz/abc/example.json', _msg)
+
+
+@patch("allensdk.core.json_utilities.write")
+@patch("allensdk.core.json_utilities.read", return_value=_msg)
+@patch.object(Manifest, 'safe_mkdir')
+def test_cacheable_presets(mkdir, ju_read, ju_write):
+    @cacheable(strategy='create',
+               post=lambda d: d[0],
+               **Cache.cache_json())
+    def get_hemispheres():
+        return _msg
+
+    assert get_hemispheres(path='/xyz/abc/example.json') == _msg[0]
+    assert get_hemispheres(path='/xyz/abc/example.json',
+                           post=len) == 1
+    assert ju_write.call_count == 2
+
+
+def test_cacher_many():
+    calls = []
+
+    def query(n, **kwargs):
+        calls.append(n)
+        return n * 2
+
+    results = Cache.cacher_many(query,
+                                [((n,), {'scale': 1}) for n in range(20)],
+                                strategy='pass_through')
+
+    assert results == [n * 2 for n in range(20)]
+    assert sorted(calls) == list(range(20))
+
+
+@patch.object(Manifest, 'safe_mkdir')
+def test_cacher_many_same_path(mkdir):
+    written = []
+
+    def writer(path, data):
+        written.append((path, data))
+
+    results = Cache.cacher_many(lambda n: n,
+                                [((n,), {'path': '/xyz/%d.json' % (n % 2)})
+                                 for n in range(6)],
+                                strategy='create',
+                                writer=writer)
+
+    assert results == list(range(6))
+    assert [d for p, d in written if p == '/xyz/0.json'] == [0, 2, 4]
+    assert [d for p, d in written if p == '/xyz/1.json'] == [1, 3, 5]
+
+
+def test_cacheable_parallel():
+    @cacheable(parallel=True,
+               pathfinder=Cache.pathfinder(file_name_position=1))
+    def get_data(n, file_name=None, offset=0):
+        return n + offset
+
+    with patch.object(Cache, 'cacher_many',
+                      wraps=Cache.cacher_many) as cacher_many:
+        results = get_data(call_list=[((1,), {}),
+                                      ((2,), {'offset': 10})],
+                           strategy='pass_through',
+                           offset=100)
+
+    assert results == [101, 12]
+    assert cacher_many.call_count == 1
+
+
+@pytest.mark.parametrize('cache_style',
+                         (Cache.cache_json_dataframe,
+                          Cache.cache_jsonl_dataframe))
+def test_cacheable_dataframe_payload(tmpdir_factory, cache_style):
+    @cacheable()
+    def get_data():
+        return pd.DataFrame([{'a': 1}, {'a': 2}])
+
+    path = str(tmpdir_factory.mktemp('data').join('example.json'))
+
+    df = get_data(path=path, strategy='lazy', **cache_style())
+    df_file = get_data(path=path, strategy='lazy', **cache_style())
+
+    assert list(df['a']) == [1, 2]
+    assert list(df_file['a']) == [1, 2]
+
+
+def test_cache_json_dataframe_dtypes(tmpdir_factory):
+    records = [{'created_at': '2017-01-01T00:00:00Z', 'code': '0123',
+                'value': 1},
+               {'created_at': '2017-01-02T00:00:00Z', 'code': '0456',
+                'value': 'a'}]
+    tmp = tmpdir_factory.mktemp('data')
+    array_path = str(tmp.join('array.json'))
+    lines_path = str(tmp.join('lines.json'))
+
+    ju.write(array_path, records)
+    ju.write_lines(lines_path, records)
+
+    array_df = Cache.json_dataframe_reader(array_path)
+    lines_df = Cache.json_dataframe_reader(lines_path)
+
+    assert list(lines_df['value']) == [1, 'a']
+    assert array_df.equals(lines_df)
+    assert (array_df.dtypes == lines_df.dtypes).all()
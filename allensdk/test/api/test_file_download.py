@@ -38,7 +38,6 @@ from mock import Mock, patch
 from allensdk.api.cache import cacheable, Cache
 from allensdk.config.manifest import Manifest
 import allensdk.core.json_utilities as ju
-import pandas.io.json as pj
 import pandas as pd
 from allensdk.api.queries.mouse_connectivity_api import MouseConnectivityApi as MCA
 
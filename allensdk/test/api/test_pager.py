@@ -38,7 +38,6 @@ from mock import MagicMock, call, patch, mock_open
 from allensdk.api.queries.rma_pager import RmaPager, pageable
 from allensdk.api.queries.rma_api import RmaApi
 import allensdk.core.json_utilities as ju
-import pandas.io.json as pj
 import pandas as pd
 from six.moves import builtins
 import os
@@ -58,9 +57,10 @@ def pager():
 
 _msg = [{'whatever': True}]
 _pd_msg = pd.DataFrame(_msg)
-_csv_msg = pd.DataFrame.from_csv(StringIO.StringIO(""",whatever
+_csv_msg = pd.read_csv(StringIO.StringIO(""",whatever
 0,True
-"""))
+"""),
+                       index_col=0)
 
 _read_url_get_msg5 = [{'msg': _msg},
                       {'msg': _msg},
@@ -145,11 +145,11 @@ def test_all(ju_read_url_get, rma):
                          (Cache.cache_csv,
                           Cache.cache_csv_json,
                           Cache.cache_csv_dataframe))
-@patch.object(pd.DataFrame, "from_csv", return_value=_csv_msg)
+@patch("pandas.read_csv", return_value=_csv_msg)
 @patch("allensdk.core.json_utilities.read_url_get",
        side_effect=_read_url_get_msg5)
 @patch("os.makedirs")
-def test_cacheable_pageable_csv(os_makedirs, ju_read_url_get, from_csv,
+def test_cacheable_pageable_csv(os_makedirs, ju_read_url_get, read_csv,
                                 cache_style):
     archive_templates = \
         {"cam_cell_queries": [
@@ -193,7 +193,9 @@ def test_cacheable_pageable_csv(os_makedirs, ju_read_url_get, from_csv,
                          [0, 1, 2, 3, 4, 5])
 
     assert ju_read_url_get.call_args_list == list(expected_calls)
-    from_csv.assert_called_once_with('/path/to/cam_cell_metrics.csv')
+    read_csv.assert_called_once_with('/path/to/cam_cell_metrics.csv',
+                                     index_col=0, dtype=None,
+                                     memory_map=True)
 
     assert csv_writerow.call_args_list == [call({'whatever': 'whatever'}),
                                            call({'whatever': True}),
@@ -202,16 +204,22 @@ def test_cacheable_pageable_csv(os_makedirs, ju_read_url_get, from_csv,
                                            call({'whatever': True}),
                                            call({'whatever': True})]
 
-@pytest.mark.parametrize("cache_style",
-                         (Cache.cache_json,
-                          Cache.cache_json_dataframe))
+@pytest.mark.parametrize("cache_style,read_data,expected_writes",
+                         ((Cache.cache_json,
+                           _read_msg5,
+                           [call('[\n  {\n    "whatever": true\n  },\n  {\n    "whatever": true\n  },\n  {\n    "whatever": true\n  },\n  {\n    "whatever": true\n  },\n  {\n    "whatever": true\n  }\n]')]),
+                          (Cache.cache_json_dataframe,
+                           b'{',
+                           [call(b'{"whatever": true}\n')] * 5)))
+@patch("allensdk.core.json_utilities.orjson", None)
 @patch("allensdk.core.json_utilities.read", return_value=_read_msg5)
-@patch("pandas.io.json.read_json", return_value=_pj_msg5)
+@patch("pandas.read_json", return_value=_pj_msg5)
 @patch("allensdk.core.json_utilities.read_url_get",
        side_effect=_read_url_get_msg5)
 @patch("os.makedirs")
 def test_cacheable_pageable_json(os_makedirs, ju_read_url_get, pj_read_json,
-                                 ju_read, cache_style):
+                                 ju_read, cache_style, read_data,
+                                 expected_writes):
     archive_templates = \
         {"cam_cell_queries": [
             {'name': 'cam_cell_metric',
@@ -237,11 +245,7 @@ def test_cacheable_pageable_json(os_makedirs, ju_read_url_get, pj_read_json,
                create=True) as open_mock:
         open_mock.return_value.read = \
             MagicMock(name='read',
-                      return_value=[{'whatever': True},
-                                    {'whatever': True},
-                                    {'whatever': True},
-                                    {'whatever': True},
-                                    {'whatever': True}])
+                      return_value=read_data)
         cam_cell_metrics = \
             get_cam_cell_metrics(strategy='create',
                                  path='/path/to/cam_cell_metrics.json',
@@ -260,7 +264,11 @@ def test_cacheable_pageable_json(os_makedirs, ju_read_url_get, pj_read_json,
     expected_calls = map(lambda c: call(base_query.format(c)),
                          [0, 1, 2, 3, 4, 5])
 
-    open_mock.assert_called_once_with('/path/to/cam_cell_metrics.json', 'wb')
-    open_mock.return_value.write.assert_called_once_with('[\n  {\n    "whatever": true\n  },\n  {\n    "whatever": true\n  },\n  {\n    "whatever": true\n  },\n  {\n    "whatever": true\n  },\n  {\n    "whatever": true\n  }\n]')
+    assert open_mock.call_args_list[0] == \
+        call('/path/to/cam_cell_metrics.json', 'wb')
+    assert open_mock.return_value.write.call_args_list == expected_writes
+    if cache_style is Cache.cache_json_dataframe:
+        pj_read_json.assert_called_once_with('/path/to/cam_cell_metrics.json',
+                                             orient='records', lines=True)
     assert ju_read_url_get.call_args_list == list(expected_calls)
     assert len(cam_cell_metrics) == 5
@@ -42,7 +42,6 @@ from mock import MagicMock, patch, call, mock_open
 from six.moves import builtins
 import itertools as it
 import allensdk.core.json_utilities as ju
-import pandas.io.json as pj
 import os
 
 _MOCK_PATH = '/path/to/xyz.txt'
@@ -251,8 +250,8 @@ def test_get_reconstruction(cache_fixture,
 @pytest.mark.parametrize('path_exists',
                          (False, True))
 @patch.object(DataFrame, "to_csv")
-@patch.object(DataFrame, "from_csv")
-def test_get_reconstruction_with_api(from_csv,
+@patch("pandas.read_csv")
+def test_get_reconstruction_with_api(read_csv,
                                      to_csv,
                                      cache_fixture,
                                      cell_id,
@@ -280,8 +279,8 @@ def test_get_reconstruction_with_api(from_csv,
 
 
 @patch.object(DataFrame, "to_csv")
-@patch.object(DataFrame, "from_csv")
-def test_get_reconstruction_exception(from_csv,
+@patch("pandas.read_csv")
+def test_get_reconstruction_exception(read_csv,
                                       to_csv,
                                       cache_fixture,
                                       cell_id):
@@ -411,8 +410,8 @@ def test_get_ephys_features(cache_fixture,
                          it.product((False,True),
                                     (False,True)))
 @patch.object(DataFrame, "to_csv")
-@patch.object(DataFrame, "from_csv")
-def test_get_ephys_features_with_api(from_csv,
+@patch("pandas.read_csv")
+def test_get_ephys_features_with_api(read_csv,
                                      to_csv,
                                      cache_fixture,
                                      df,
@@ -436,7 +435,9 @@ def test_get_ephys_features_with_api(from_csv,
                         _ = ctc.get_ephys_features(dataframe=df)
 
     if path_exists:
-        from_csv.assert_called_once_with(_MOCK_PATH)
+        read_csv.assert_called_once_with(_MOCK_PATH,
+                                         index_col=0, dtype=None,
+                                         memory_map=True)
     else:
         mkd.assert_called_once_with(_MOCK_PATH)
         assert query_mock.called
@@ -446,10 +447,10 @@ def test_get_ephys_features_with_api(from_csv,
                          it.product((False, True),
                                     (False, True)))
 @patch.object(DataFrame, "to_csv")
-@patch.object(DataFrame, "from_csv",
+@patch("pandas.read_csv",
               return_value=DataFrame([{ 'stuff': 'whatever'},
                                       { 'stuff': 'nonsense'}]))
-def test_get_morphology_features(from_csv,
+def test_get_morphology_features(read_csv,
                                  to_csv,
                                  cache_fixture,
                                  path_exists,
@@ -479,7 +480,9 @@ def test_get_morphology_features(from_csv,
     
     if path_exists:
         if df:
-            from_csv.assert_called_once_with(_MOCK_PATH)
+            read_csv.assert_called_once_with(_MOCK_PATH,
+                                             index_col=0, dtype=None,
+                                             memory_map=True)
         else:
             assert True
         assert not mkd.called
@@ -547,10 +550,10 @@ def test_get_ephys_sweeps_with_api(cache_fixture,
                                     (False, True)))
 @patch('pandas.DataFrame.merge')
 @patch.object(DataFrame, "to_csv")
-@patch.object(DataFrame, "from_csv",
+@patch("pandas.read_csv",
               return_value=DataFrame([{ 'stuff': 'whatever'},
                                       { 'stuff': 'nonsense'}]))
-def test_get_all_features(from_csv,
+def test_get_all_features(read_csv,
                           to_csv,
                           mock_merge,
                           cache_fixture,
@@ -578,7 +581,7 @@ def test_get_all_features(from_csv,
                                         require_reconstruction=require_reconstruction)
 
     if path_exists:
-        assert from_csv.called
+        assert read_csv.called
     else:
         assert query_mock.called
     
@@ -33,10 +33,13 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 #
+import os
+import simplejson as json
 import allensdk.core.json_utilities as ju
 import pytest
 from mock import patch, MagicMock, call
 import numpy as np
+import pandas as pd
 
 
 @pytest.fixture
@@ -122,3 +125,55 @@ def test_write_list(dict_obj):
   ]
 }"""
     assert s_in == s_out
+
+
+def test_write_read(dict_obj, fn_temp_dir):
+    path = os.path.join(fn_temp_dir, 'dict_obj.json')
+
+    ju.write(path, dict_obj)
+    obj = ju.read(path)
+
+    assert obj == json.loads(ju.write_string(dict_obj))
+
+
+def test_write_read_generator(fn_temp_dir):
+    path = os.path.join(fn_temp_dir, 'generator.json')
+
+    ju.write(path, ({'n': n} for n in range(3)))
+
+    assert ju.read(path) == [{'n': 0}, {'n': 1}, {'n': 2}]
+
+
+@pytest.mark.parametrize('use_orjson', (True, False))
+def test_write_read_series(fn_temp_dir, use_orjson):
+    path = os.path.join(fn_temp_dir, 'series.json')
+    obj = {'s': pd.Series([1, 2], index=['x', 'y'])}
+
+    if use_orjson:
+        pytest.importorskip('orjson')
+        ju.write(path, obj)
+    else:
+        with patch('allensdk.core.json_utilities.orjson', None):
+            ju.write(path, obj)
+
+    assert ju.read(path) == {'s': [1, 2]}
+
+
+def test_write_lines(dict_obj, fn_temp_dir):
+    path = os.path.join(fn_temp_dir, 'records.jsonl')
+
+    ju.write_lines(path, [dict_obj, {'nan': float('nan')}])
+
+    with open(path) as f:
+        lines = f.read().splitlines()
+
+    assert len(lines) == 2
+    assert json.loads(lines[0]) == json.loads(ju.write_string(dict_obj))
+    assert json.loads(lines[1]) == {'nan': None}
+
+
+def test_read_empty(fn_temp_dir):
+    path = os.path.join(fn_temp_dir, 'empty.json')
+    open(path, 'w').close()
+
+    assert ju.read(path) == {}
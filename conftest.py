@@ -2,6 +2,7 @@ import matplotlib
 matplotlib.use('agg')
 import pytest  # noqa: E402
 from allensdk.test_utilities.temp_dir import temp_dir  # noqa: E402
+from allensdk.api.cache import Cache  # noqa: E402
 
 
 @pytest.fixture(scope="function")
@@ -12,3 +13,12 @@ def fn_temp_dir(request):
 @pytest.fixture(scope="module")
 def md_temp_dir(request):
     return temp_dir(request)
+
+
+@pytest.fixture(autouse=True)
+def reset_cache_state():
+    # tests patch os.path.exists and readers; don't let remembered paths
+    # or reads leak between them
+    yield
+    Cache.reset_exists_cache()
+    Cache.reset_read_cache()